@@ -102,6 +102,22 @@ def test_dataset():
     assert count_samples_tuple(ds) == 47
 
 
+def test_disabled_stages_not_added():
+    ds = wds.WebDataset(local_data, shardshuffle=False)
+    n = len(ds.pipeline)
+    assert ds.log_keys() is ds
+    assert ds.shuffle(1) is ds
+    assert len(ds.pipeline) == n
+    assert count_samples_tuple(ds) == 47
+
+
+def test_local_path():
+    ds = wds.WebDataset(local_data, shardshuffle=False)
+    for sample in ds:
+        assert sample["__local_path__"] == local_data
+        assert sample["__url__"] == local_data
+
+
 def test_dataset_resampled():
     """
     Tests that the WebDataset object created from resampled locally hosted data contains the expected number of samples.
@@ -6,7 +6,9 @@ import pytest
 from webdataset.filters import (
     _batched,
     _extract_keys,
+    _log_keys,
     _map,
+    _rename,
     _rename_keys,
     _rsample,
     _select,
@@ -25,12 +27,46 @@ def test_shuffle():
     assert shuffled != data  # Very low probability of being equal
 
 
+def test_shuffle_disabled():
+    data = list(range(10))
+    assert list(_shuffle(iter(data), bufsize=1)) == data
+    assert list(_shuffle(iter(data), bufsize=0)) == data
+
+
+def test_shuffle_list_input():
+    data = list(range(100))
+    shuffled = list(_shuffle(data, bufsize=20, initial=10, seed=0))
+    assert sorted(shuffled) == data
+    assert shuffled == list(_shuffle(data, bufsize=20, initial=10, seed=0))
+
+
+def test_shuffle_seeded_order():
+    # seeded shuffles must keep producing the same order across releases
+    shuffled = list(_shuffle(iter(range(20)), bufsize=10, initial=5, seed=0))
+    assert shuffled[:8] == [3, 7, 8, 0, 4, 12, 10, 9]
+
+
 def test_select():
     data = range(10)
     even = list(_select(data, lambda x: x % 2 == 0))
     assert even == [0, 2, 4, 6, 8]
 
 
+def test_log_keys(tmp_path):
+    logfile = str(tmp_path / "keys.log")
+    data = [{"__key__": str(i)} for i in range(10)]
+    assert list(_log_keys(iter(data), logfile, chunksize=3)) == data
+    with open(logfile) as stream:
+        lines = stream.read().splitlines()
+    assert [line.split("\t")[-1] for line in lines] == [str(i) for i in range(10)]
+
+
+def test_log_keys_disabled():
+    data = iter([{"__key__": "a"}])
+    assert _log_keys(data) is data
+    assert _log_keys(data, "") is data
+
+
 def test_map():
     data = range(5)
     squared = list(_map(data, lambda x: x**2))
@@ -43,6 +79,12 @@ def test_to_tuple():
     assert result == [(1, 3)] * 3
 
 
+def test_to_tuple_alternatives():
+    data = [{"png": 1, "cls": 2}, {"jpg": 3, "cls": 4}]
+    result = list(_to_tuple(data, "png;jpg cls"))
+    assert result == [(1, 2), (3, 4)]
+
+
 def test_batched():
     import numpy as np
 
@@ -76,6 +118,17 @@ def test_extract_keys(input_data, expected):
     assert result == expected
 
 
+def test_rename():
+    data = [{"__key__": "a", "png": 1, "cls": 2}, {"__key__": "b", "jpg": 3, "cls": 4}]
+    result = list(_rename(data, image="png;jpg", label="cls"))
+    assert result == [
+        {"__key__": "a", "image": 1, "label": 2},
+        {"__key__": "b", "image": 3, "label": 4},
+    ]
+    result = list(_rename(data, keep=False, image="png;jpg"))
+    assert result == [{"image": 1}, {"image": 3}]
+
+
 def test_rename_keys():
     input_data = [{"old_key": "value"}]
     result = list(_rename_keys(input_data, new_key="old_key"))
@@ -134,6 +187,13 @@ def test_batched_no_partial():
     assert lengths == [3, 3, 3]
 
 
+def test_batched_lists():
+    batches = list(_batched(iter(range(7)), batchsize=3, collation_fn=None))
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    batches = list(_batched(range(7), batchsize=3, collation_fn=None, partial=False))
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+
+
 def test_rsample_empty_input():
     assert list(_rsample([], p=0.5)) == []
 
@@ -245,3 +305,15 @@ def test_default_collation_fn_torch():
         assert isinstance(r["a"], torch.Tensor)
         assert r["a"].shape == (2, 1)
         assert list(r["a"][:, 0]) == [1, 1]
+
+
+def test_default_collation_fn_shape_mismatch():
+    import numpy as np
+    import torch
+
+    data = [{"a": np.zeros(2)}, {"a": np.zeros(3)}]
+    with pytest.raises(AssertionError):
+        default_collation_fn(data)
+    data = [{"a": torch.zeros(2)}, {"a": torch.zeros(3)}]
+    with pytest.raises(AssertionError):
+        default_collation_fn(data)
@@ -1,6 +1,8 @@
 import io
 import os
 import pickle
+import subprocess
+import sys
 from itertools import islice
 
 import numpy as np
@@ -75,6 +77,28 @@ def test_composable():
     assert len(result) == 100
 
 
+def test_close():
+    closed = []
+
+    class Stage:
+        def __init__(self, name):
+            self.name = name
+
+        def __call__(self, src):
+            return src
+
+        def close(self):
+            closed.append(self.name)
+
+    with wds.DataPipeline(
+        wds.SimpleShardList("test-{000000..000009}.tar"), Stage("a"), Stage("b")
+    ) as dataset:
+        assert len(list(iter(dataset))) == 10
+    assert closed == ["b", "a"]
+    dataset.close()
+    assert closed == ["b", "a"]
+
+
 def select_png(name):
     return name.endswith(".png")
 
@@ -186,6 +210,69 @@ def test_reader3():
     assert len(result) == 470
 
 
+def test_reader_prefetch():
+    shards = ["testdata/imagenet-000000.tgz", "testdata/tendata.tar"] * 3
+    serial = wds.DataPipeline(
+        wds.SimpleShardList(shards),
+        wds.tarfile_to_samples(),
+    )
+    prefetched = wds.DataPipeline(
+        wds.SimpleShardList(shards),
+        wds.tarfile_to_samples(prefetch=3),
+    )
+    expected = [(s["__url__"], s["__key__"]) for s in serial]
+    result = [(s["__url__"], s["__key__"]) for s in prefetched]
+    assert len(result) == 3 * (47 + 100)
+    assert result == expected
+
+
+def test_reader_prefetch_handler():
+    shards = [f"pipe:dd if={local_data} bs=1024 count=10", local_data]
+    serial = wds.DataPipeline(
+        wds.SimpleShardList(shards),
+        wds.tarfile_to_samples(handler=handlers.ignore_and_continue),
+    )
+    prefetched = wds.DataPipeline(
+        wds.SimpleShardList(shards),
+        wds.tarfile_to_samples(handler=handlers.ignore_and_continue, prefetch=2),
+    )
+    assert count_samples(prefetched) == count_samples(serial)
+
+
+def test_reader_prefetch_failed_shard():
+    shards = [f"pipe:dd if={local_data} bs=1024 count=10", local_data]
+    serial = wds.tariterators.tar_file_expander(
+        wds.tariterators.url_opener(wds.SimpleShardList(shards)),
+        handler=handlers.ignore_and_continue,
+    )
+    prefetched = wds.tariterators.tar_file_prefetcher(
+        wds.tariterators.url_opener(wds.SimpleShardList(shards)),
+        prefetch=2,
+        handler=handlers.ignore_and_continue,
+    )
+    expected = [s.get("fname") for s in serial]
+    assert [s.get("fname") for s in prefetched] == expected
+    assert expected.count(None) == 1
+
+
+def test_reader_prefetch_exit():
+    script = (
+        "import webdataset as wds\n"
+        f"ds = wds.DataPipeline(wds.SimpleShardList([{local_data!r}] * 4), wds.tarfile_to_samples(prefetch=2))\n"
+        "it = iter(ds)\n"
+        "next(it)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+
+
+def test_webdataset_prefetch():
+    shards = [local_data] * 3
+    serial = wds.WebDataset(shards, shardshuffle=False)
+    prefetched = wds.WebDataset(shards, shardshuffle=False, prefetch=2)
+    expected = [(s["__url__"], s["__key__"]) for s in serial]
+    assert [(s["__url__"], s["__key__"]) for s in prefetched] == expected
+
+
 def test_splitting():
     dataset = wds.DataPipeline(
         wds.SimpleShardList(list(map(str, range(10)))),
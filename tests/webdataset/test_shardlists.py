@@ -6,7 +6,14 @@ from pathlib import Path
 
 import pytest
 
-from webdataset.shardlists import DirectoryShardList, ResampledShards, SimpleShardList
+from webdataset.shardlists import (
+    DirectoryShardList,
+    ResampledShards,
+    SimpleShardList,
+    expand_urls,
+    split_by_node_and_worker,
+)
+from webdataset.tariterators import shardlist
 
 
 class TestSimpleShardList:
@@ -40,6 +47,30 @@ class TestSimpleShardList:
         assert set(shard["url"] for shard in shards) == set(self.urls)
 
 
+def test_split_by_node_and_worker(monkeypatch):
+    monkeypatch.setenv("WORLD_SIZE", "2")
+    monkeypatch.setenv("NUM_WORKERS", "3")
+    splits = []
+    for rank in range(2):
+        for worker in range(3):
+            monkeypatch.setenv("RANK", str(rank))
+            monkeypatch.setenv("WORKER", str(worker))
+            splits.append(list(split_by_node_and_worker(iter(range(20)))))
+    assert sorted(x for split in splits for x in split) == list(range(20))
+    assert all(len(split) in (3, 4) for split in splits)
+
+
+def test_expand_urls_missing_variable(monkeypatch):
+    monkeypatch.delenv("WDS_MISSING_BUCKET", raising=False)
+    with pytest.raises(AssertionError, match="variable WDS_MISSING_BUCKET$"):
+        expand_urls("${MISSING_BUCKET}/shard-{000..009}.tar")
+
+
+def test_shardlist_shuffle_braces():
+    urls = [s["url"] for s in shardlist("shard-{000..009}.tar", shuffle=True)]
+    assert sorted(urls) == [f"shard-{i:03d}.tar" for i in range(10)]
+
+
 class TestResampledShards:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -45,3 +45,41 @@ def test_detshuffle():
     result12 = list(iter(dataset1))
     assert result12 == result22
     assert dataset2.stage(1).epoch == 1
+
+
+def test_detshuffle_set_epoch():
+    dataset = wds.DataPipeline(
+        wds.SimpleShardList("{000000..000999}"),
+        wds.detshuffle(10),
+    )
+    result0 = list(iter(dataset))
+    result1 = list(iter(dataset))
+    dataset.stage(1).set_epoch(1)
+    assert list(iter(dataset)) == result1
+    dataset.stage(1).set_epoch(0)
+    assert list(iter(dataset)) == result0
+
+
+def test_pipeline_set_epoch():
+    dataset = wds.DataPipeline(
+        wds.SimpleShardList("{000000..000999}"),
+        wds.detshuffle(10),
+    )
+    dataset.set_epoch(3)
+    result3 = list(iter(dataset))
+    result4 = list(iter(dataset))
+    assert result3 != result4
+    dataset.set_epoch(3)
+    assert list(iter(dataset)) == result3
+
+
+def test_pipeline_set_epoch_after_iter():
+    dataset = wds.DataPipeline(
+        wds.SimpleShardList("{000000..000999}"),
+        wds.detshuffle(10),
+    )
+    dataset.set_epoch(5)
+    expected = list(iter(dataset))
+    it = iter(dataset)
+    dataset.set_epoch(5)
+    assert list(it) == expected
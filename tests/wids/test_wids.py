@@ -1,4 +1,5 @@
 import os
+import pickle
 import random
 from contextlib import contextmanager
 from unittest.mock import patch
@@ -59,6 +60,25 @@ class TestGz:
         assert sample[".txt.gz"] == ", or more info on the item.", sample
 
 
+def add_tag(sample):
+    return dict(sample, tag=1)
+
+
+def increment_tag(sample):
+    return dict(sample, tag=sample["tag"] + 1)
+
+
+@pytest.mark.parametrize("transformations", [[], [add_tag, increment_tag]])
+def test_shard_list_dataset_pickle(transformations):
+    shards = [dict(url="testdata/mpdata.tar", nsamples=100)]
+    dataset = wids.ShardListDataset(shards, transformations=transformations)
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert restored.transformations == transformations
+    sample = restored[17]
+    assert sample["__key__"] == "000017"
+    assert sample.get("tag") == (2 if transformations else None)
+
+
 class TestShardListDataset:
     @pytest.fixture(scope="class")
     def class_tmpdir(self, tmp_path_factory: pytest.TempPathFactory):
@@ -92,6 +112,20 @@ class TestShardListDataset:
     def test_length(self, shard_list_dataset: ShardListDataset):
         assert len(shard_list_dataset) == 203
 
+    def test_add_transform(self, shard_list_dataset: ShardListDataset):
+        shard_list_dataset.add_transform(lambda sample: dict(sample, tag=1))
+        shard_list_dataset.add_transform(lambda sample: dict(sample, tag=sample["tag"] + 1))
+        sample = shard_list_dataset[17]
+        assert sample["__key__"] == "000017"
+        assert sample["tag"] == 2
+
+    def test_close(self, shard_list_dataset: ShardListDataset):
+        with shard_list_dataset as dataset:
+            assert dataset[17]["__key__"] == "000017"
+            assert len(dataset.cache) == 1
+        assert dataset.cache is None
+        dataset.close()
+
     def test_getshard(self, shard_list_dataset: ShardListDataset):
         shard, _, _ = shard_list_dataset.get_shard(0)
         assert os.path.exists(shard.path)
@@ -101,3 +101,22 @@ def test_eviction_and_release_callback():
     assert (
         evicted_keys[0] == "b"
     )  # The key that was evicted should be passed to the release handler
+
+
+# Test that replaced and cleared values are released exactly once
+def test_replace_and_clear_release_once():
+    released = []
+
+    def release_handler(key, value):
+        released.append((key, value))
+
+    cache = LRUCache(3, release_handler=release_handler)
+    cache["a"] = 1
+    cache["a"] = 1  # same value, nothing to release
+    assert released == []
+    cache["a"] = 2  # replaced value is released
+    assert released == [("a", 1)]
+    cache["b"] = 3
+    cache.clear()
+    assert sorted(released) == [("a", 1), ("a", 2), ("b", 3)]
+    assert len(cache) == 0
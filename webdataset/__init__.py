@@ -70,6 +70,7 @@ from .shardlists import (
     shardspec,
     single_node_only,
     split_by_node,
+    split_by_node_and_worker,
     split_by_worker,
 )
 from .tariterators import tarfile_samples, tarfile_to_samples
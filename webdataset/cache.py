@@ -170,7 +170,7 @@ class StreamingOpen:
             parsed = urlparse(url)
             try:
                 if parsed.scheme in ["", "file"]:
-                    stream = open(parsed.path, "rb")
+                    stream = open(parsed.path, "rb", buffering=gopen.local_bufsize())
                     yield dict(url=url, stream=stream, local_path=parsed.path)
                 else:
                     stream = gopen.gopen(url)
@@ -283,7 +283,7 @@ class FileCache:
             for _ in range(10):
                 try:
                     dest = self.get_file(url)
-                    stream = open(dest, "rb")
+                    stream = open(dest, "rb", buffering=gopen.local_bufsize())
                 except Exception as e:
                     if self.handler(e):
                         continue
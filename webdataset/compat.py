@@ -10,7 +10,7 @@ from . import autodecode, cache, filters, shardlists, utils
 from .filters import pipelinefilter, reraise_exception
 from .pipeline import DataPipeline
 from .pytorch import DataLoader
-from .tariterators import group_by_keys, tar_file_expander
+from .tariterators import group_by_keys, tar_file_expander, tar_file_prefetcher
 
 
 class FluidInterface:
@@ -77,8 +77,10 @@ class FluidInterface:
             logfile (str, optional): Path to the log file. If None, logging is disabled.
 
         Returns:
-            FluidInterface: Updated pipeline with log_keys filter.
+            FluidInterface: Updated pipeline with log_keys filter, or self if logging is disabled.
         """
+        if logfile is None or logfile == "":
+            return self
         return self.compose(filters.log_keys(logfile))
 
     def shuffle(self, size, **kw):
@@ -91,9 +93,9 @@ class FluidInterface:
             **kw: Additional keyword arguments for filters.shuffle.
 
         Returns:
-            FluidInterface: Updated pipeline with shuffle filter, or self if size < 1.
+            FluidInterface: Updated pipeline with shuffle filter, or self if size <= 1.
         """
-        if size < 1:
+        if size <= 1:
             return self
         else:
             return self.compose(filters.shuffle(size, **kw))
@@ -353,6 +355,7 @@ class WebDataset(DataPipeline, FluidInterface):
         empty_check: Whether to check for empty datasets. Defaults to True.
         verbose: Whether to print verbose output. Defaults to False.
         seed: Random seed for shuffling. Defaults to None.
+        prefetch: Number of shards to read ahead in threads. Defaults to 0 (read serially).
 
     Raises:
         ValueError: If the cache directory does not exist or if the URL type is not supported.
@@ -377,6 +380,7 @@ class WebDataset(DataPipeline, FluidInterface):
         empty_check=True,
         verbose=False,
         seed=None,
+        prefetch=0,
     ):
         super().__init__()
         if resampled:
@@ -414,8 +418,8 @@ class WebDataset(DataPipeline, FluidInterface):
         if workersplitter:
             self.append(workersplitter)
 
-        # add a shard shuffler
-        if args.shardshuffle is not None:
+        # add a shard shuffler; a buffer of one or less doesn't change the order
+        if args.shardshuffle is not None and args.shardshuffle > 1:
             if args.detshuffle:
                 self.append(filters.detshuffle(args.shardshuffle, seed=self.seed))
             else:
@@ -433,12 +437,25 @@ class WebDataset(DataPipeline, FluidInterface):
 
         # now we need to open each stream and read the tar files contained in it
         # this generates a stream of dict(fname=..., data=...) objects
-        expander = pipelinefilter(tar_file_expander)
-        self.append(
-            expander(
-                handler=handler, select_files=select_files, rename_files=rename_files
+        if prefetch > 0:
+            expander = pipelinefilter(tar_file_prefetcher)
+            self.append(
+                expander(
+                    prefetch=prefetch,
+                    handler=handler,
+                    select_files=select_files,
+                    rename_files=rename_files,
+                )
+            )
+        else:
+            expander = pipelinefilter(tar_file_expander)
+            self.append(
+                expander(
+                    handler=handler,
+                    select_files=select_files,
+                    rename_files=rename_files,
+                )
             )
-        )
 
         # finally, the files need to be groups into samples
         # this generates a stream of dict(__key__=..., ...=...) objects
@@ -512,22 +529,6 @@ class WebDataset(DataPipeline, FluidInterface):
 
         raise ValueError(f"cannot handle urls of type {type(args.urls)}")
 
-    def __enter__(self):
-        """Enter the runtime context for the WebDataset.
-
-        Returns:
-            self: The WebDataset instance.
-        """
-        return self
-
-    def __exit__(self, *args):
-        """Exit the runtime context for the WebDataset.
-
-        Args:
-            *args: Exception type, value, and traceback if an exception occurred.
-        """
-        self.close()
-
 
 class FluidWrapper(DataPipeline, FluidInterface):
     """Small fluid-interface wrapper for DataPipeline."""
@@ -322,7 +322,9 @@ def pick(buf, rng):
     Returns:
         The randomly picked item.
     """
-    k = rng.randint(0, len(buf) - 1)
+    # randrange draws the same sequence as randint(0, len(buf) - 1), so seeded
+    # shuffles stay reproducible, but skips randint's extra call overhead
+    k = rng.randrange(len(buf))
     sample = buf[k]
     buf[k] = buf[-1]
     buf.pop()
@@ -348,12 +350,17 @@ def _shuffle(data, bufsize=1000, initial=100, rng=None, seed=None, handler=None)
     Yields:
         Shuffled items from the input iterator.
     """
+    if bufsize <= 1:
+        # a buffer of one or less doesn't change the order
+        yield from data
+        return
     if seed is not None:
         assert rng is None
         rng = random.Random(seed)
     elif rng is None:
         rng = random.Random(int((os.getpid() + time.time()) * 1e9))
     initial = min(initial, bufsize)
+    data = iter(data)
     buf = []
     for sample in data:
         buf.append(sample)
@@ -399,6 +406,18 @@ class detshuffle(PipelineStage):
         self.seed = seed
         self.epoch = epoch
 
+    def set_epoch(self, epoch):
+        """
+        Set the epoch used for the next run.
+
+        This makes the shuffle order of a resumed or restarted training
+        run reproducible, independent of how often the stage was run before.
+
+        Args:
+            epoch (int): Epoch number for the next run.
+        """
+        self.epoch = epoch - 1
+
     def run(self, src):
         """
         Run the shuffling process on the input source.
@@ -410,8 +429,7 @@ class detshuffle(PipelineStage):
             Iterator: Shuffled data iterator.
         """
         self.epoch += 1
-        rng = random.Random()
-        rng.seed(self.seed + self.epoch)
+        rng = random.Random(self.seed + self.epoch)
         return _shuffle(src, self.bufsize, self.initial, rng)
 
 
@@ -434,31 +452,66 @@ def _select(data, predicate):
 select = pipelinefilter(_select)
 
 
-def _log_keys(data, logfile=None):
+def _write_keys(data, logfile, chunksize):
     """
-    Log keys of the samples passing through the pipeline.
+    Write keys of the samples passing through the pipeline to a log file.
+
+    Log lines are collected and written in chunks, so that the file is
+    locked and written once per chunk rather than once per sample.
 
     Args:
         data: Source iterator.
         logfile (str): Path to the log file.
+        chunksize (int): Number of log lines to write at once.
 
     Yields:
         Samples from the input iterator.
     """
     import fcntl
 
-    if logfile is None or logfile == "":
-        yield from data
-    else:
-        with open(logfile, "a") as stream:
+    with open(logfile, "a") as stream:
+
+        def write(lines):
+            try:
+                fcntl.flock(stream.fileno(), fcntl.LOCK_EX)
+                stream.write("".join(lines))
+                stream.flush()
+            finally:
+                fcntl.flock(stream.fileno(), fcntl.LOCK_UN)
+
+        lines = []
+        try:
             for i, sample in enumerate(data):
-                buf = f"{i}\t{sample.get('__worker__')}\t{sample.get('__rank__')}\t{sample.get('__key__')}\n"
-                try:
-                    fcntl.flock(stream.fileno(), fcntl.LOCK_EX)
-                    stream.write(buf)
-                finally:
-                    fcntl.flock(stream.fileno(), fcntl.LOCK_UN)
+                lines.append(
+                    f"{i}\t{sample.get('__worker__')}\t{sample.get('__rank__')}\t{sample.get('__key__')}\n"
+                )
+                if len(lines) >= chunksize:
+                    write(lines)
+                    lines = []
                 yield sample
+        finally:
+            if len(lines) > 0:
+                write(lines)
+
+
+def _log_keys(data, logfile=None, chunksize=1024):
+    """
+    Log keys of the samples passing through the pipeline.
+
+    When logging is disabled, the input is returned as is, so the stage
+    adds no per-sample overhead.
+
+    Args:
+        data: Source iterator.
+        logfile (str): Path to the log file.
+        chunksize (int): Number of log lines to write at once.
+
+    Returns:
+        Iterator over the samples from the input iterator.
+    """
+    if logfile is None or logfile == "":
+        return iter(data)
+    return _write_keys(data, logfile, chunksize)
 
 
 log_keys = pipelinefilter(_log_keys)
@@ -549,25 +602,19 @@ def _rename(data, handler=reraise_exception, keep=True, **kw):
     Raises:
         Exception: If the handler doesn't handle an exception.
     """
+    # resolve the rename map once instead of re-parsing it for every sample
+    renamings = [(k, v.split(";") if isinstance(v, str) else v) for k, v in kw.items()]
+    to_be_replaced = frozenset(x for _, v in renamings for x in v)
     for sample in data:
         try:
             if not keep:
                 yield {
-                    k: getfirst(sample, v, missing_is_error=True) for k, v in kw.items()
+                    k: getfirst(sample, v, missing_is_error=True) for k, v in renamings
                 }
             else:
-
-                def listify(v):
-                    return v.split(";") if isinstance(v, str) else v
-
-                to_be_replaced = {x for v in kw.values() for x in listify(v)}
                 result = {k: v for k, v in sample.items() if k not in to_be_replaced}
-                result.update(
-                    {
-                        k: getfirst(sample, v, missing_is_error=True)
-                        for k, v in kw.items()
-                    }
-                )
+                for k, v in renamings:
+                    result[k] = getfirst(sample, v, missing_is_error=True)
                 yield result
         except Exception as exn:
             if handler(exn):
@@ -661,11 +708,13 @@ def _to_tuple(
         none_is_error = missing_is_error
     if len(args) == 1 and isinstance(args[0], str) and " " in args[0]:
         args = args[0].split()
+    # split the key alternatives once rather than in getfirst for every sample
+    fields = [f.split(";") if isinstance(f, str) else f for f in args]
 
     for sample in data:
         try:
             result = tuple(
-                getfirst(sample, f, missing_is_error=missing_is_error) for f in args
+                getfirst(sample, f, missing_is_error=missing_is_error) for f in fields
             )
             if none_is_error and any(x is None for x in result):
                 raise ValueError(f"to_tuple {args} got {sample.keys()}")
@@ -716,7 +765,23 @@ def _map_tuple(data, *args, handler=reraise_exception):
 map_tuple = pipelinefilter(_map_tuple)
 
 
+def check_equal_shapes(b):
+    """
+    Check that all tensors in a batch have the same shape.
+
+    Args:
+        b (list): List of arrays or tensors.
+
+    Raises:
+        AssertionError: If the shapes differ.
+    """
+    shapes = set(x.shape for x in b)
+    assert len(shapes) == 1, f"all shapes must be equal in collation, got {shapes}"
+
+
 def combine_values(b, combine_tensors=True, combine_scalars=True):
+    # Stacking copies all values into one contiguous buffer in C and fails
+    # on mismatched shapes, so shapes are only inspected to report errors.
     if isinstance(b[0], (int, float)):
         if combine_scalars:
             b = np.array(list(b))
@@ -724,18 +789,21 @@ def combine_values(b, combine_tensors=True, combine_scalars=True):
         if combine_tensors:
             import torch
 
-            shapes = set(x.shape for x in b)
-            assert (
-                len(shapes) == 1
-            ), f"all shapes must be equal in collation, got {shapes}"
-            b = torch.stack(list(b))
+            try:
+                b = torch.stack(list(b))
+            except RuntimeError:
+                check_equal_shapes(b)
+                raise
     elif isinstance(b[0], np.ndarray):
         if combine_tensors:
-            shapes = set(x.shape for x in b)
-            assert (
-                len(shapes) == 1
-            ), f"all shapes must be equal in collation, got {shapes}"
-            b = np.array(list(b))
+            try:
+                result = np.array(list(b))
+            except ValueError:
+                check_equal_shapes(b)
+                raise
+            if result.ndim != b[0].ndim + 1:
+                check_equal_shapes(b)
+            b = result
     else:
         b = list(b)
     return b
@@ -795,17 +863,15 @@ def _batched(
     Yields:
         Batches of samples.
     """
-    batch = []
-    for sample in data:
-        if len(batch) >= batchsize:
-            if collation_fn is not None:
-                batch = collation_fn(batch)
-            yield batch
-            batch = []
-        batch.append(sample)
-    if len(batch) == 0:
-        return
-    elif len(batch) == batchsize or partial:
+    # islice fills each batch in C instead of appending sample by sample;
+    # every batch is a new list since collation_fn may keep a reference to it
+    data = iter(data)
+    while True:
+        batch = list(itertools.islice(data, batchsize))
+        if len(batch) == 0:
+            return
+        if len(batch) < batchsize and not partial:
+            return
         if collation_fn is not None:
             batch = collation_fn(batch)
         yield batch
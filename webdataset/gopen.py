@@ -15,6 +15,19 @@ from urllib.request import url2pathname
 # global used for printing additional node information during verbose output
 info = {}
 
+# shards are read sequentially, so large buffers turn the many small reads
+# done by tarfile into few system calls
+default_bufsize = 4 << 20
+
+
+def local_bufsize():
+    """Return the buffer size for local files.
+
+    Returns:
+        The value of GOPEN_BUFFER if set, otherwise default_bufsize.
+    """
+    return int(os.environ.get("GOPEN_BUFFER", default_bufsize))
+
 
 class Pipe:
     """Wrapper class for subprocess.Pipe.
@@ -484,7 +497,7 @@ def rewrite_url(url):
     return url
 
 
-def gopen(url, mode="rb", bufsize=8192, **kw):
+def gopen(url, mode="rb", bufsize=default_bufsize, **kw):
     """Open the URL using various schemes and protocols.
 
     This function provides a unified interface for opening resources specified by URLs,
@@ -505,13 +518,13 @@ def gopen(url, mode="rb", bufsize=8192, **kw):
       Format: GOPEN_VERBOSE=1
     - USE_AIS_FOR: Specifies which cloud storage services should use AIS (and its cache) for access.
       Format: USE_AIS_FOR=aws:gs:s3
-    - GOPEN_BUFFER: Sets the buffer size for file operations (in bytes).
+    - GOPEN_BUFFER: Sets the buffer size for local file operations (in bytes).
       Format: GOPEN_BUFFER=8192
 
     Args:
         url (str): The source URL or file path to open.
         mode (str): The mode for opening the resource. Only "rb" (read binary) and "wb" (write binary) are supported.
-        bufsize (int): The buffer size for file operations. Default is 8192 bytes.
+        bufsize (int): The buffer size for file operations. Default is 4 MiB.
         **kw: Additional keyword arguments to pass to the underlying open function.
 
     Returns:
@@ -540,11 +553,9 @@ def gopen(url, mode="rb", bufsize=8192, **kw):
     url = rewrite_url(url)
     pr = urlparse(url)
     if pr.scheme == "":
-        bufsize = int(os.environ.get("GOPEN_BUFFER", -1))
-        return open(url, mode, buffering=bufsize)
+        return open(url, mode, buffering=local_bufsize())
     if pr.scheme == "file":
-        bufsize = int(os.environ.get("GOPEN_BUFFER", -1))
-        return open(url2pathname(pr.path), mode, buffering=bufsize)
+        return open(url2pathname(pr.path), mode, buffering=local_bufsize())
     handler = gopen_schemes["__default__"]
     handler = gopen_schemes.get(pr.scheme, handler)
     return handler(url, mode, bufsize, **kw)
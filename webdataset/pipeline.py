@@ -52,12 +52,45 @@ class DataPipeline(IterableDataset, PipelineStage):
                 self.pipeline.append(arg)
 
     def close(self):
-        """Close the pipeline and release resources."""
-        for step in self.pipeline:
+        """Close the pipeline and release resources.
+
+        Stages are closed from the consumer end; closing twice is a no-op.
+        """
+        pipeline = getattr(self, "pipeline", None)
+        if pipeline is None:
+            return
+        for step in reversed(pipeline):
             if hasattr(step, "close"):
                 step.close()
         del self.pipeline
 
+    def __enter__(self):
+        """Enter the runtime context for the pipeline.
+
+        Returns:
+            self: The pipeline instance.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """Exit the runtime context for the pipeline, closing it.
+
+        Args:
+            *args: Exception type, value, and traceback if an exception occurred.
+        """
+        self.close()
+
+    def set_epoch(self, epoch):
+        """Set the epoch on all pipeline stages that support it.
+
+        Args:
+            epoch: The epoch number passed to each stage's set_epoch method.
+        """
+        for step in self.pipeline:
+            set_epoch = getattr(step, "set_epoch", None)
+            if set_epoch is not None:
+                set_epoch(epoch)
+
     def invoke(self, f, *args, **kwargs):
         """Apply a pipeline stage, possibly to the output of a previous stage.
 
@@ -109,6 +142,14 @@ class DataPipeline(IterableDataset, PipelineStage):
                 # if the dataset is empty, don't keep looping
                 break
 
+    def _iterator_once(self):
+        """Lazily iterate through a single epoch of the pipeline.
+
+        Yields:
+            Samples from the dataset.
+        """
+        yield from self.iterator1()
+
     def __iter__(self):
         """Create an iterator through the pipeline, repeating and slicing as requested.
 
@@ -121,7 +162,10 @@ class DataPipeline(IterableDataset, PipelineStage):
             else:
                 return self.iterator()
         else:
-            return self.iterator()
+            # a single epoch needs no repetition bookkeeping; yield from
+            # delegates to the stages directly, but still builds them lazily
+            # on the first next() like the repeating iterator does
+            return self._iterator_once()
 
     def stage(self, i):
         """Return pipeline stage i.
@@ -44,7 +44,7 @@ def envlookup(m):
     """
     key = m.group(1)
     key = "WDS_" + key
-    assert key in os.environ, f"missing environment variable wds_{key}"
+    assert key in os.environ, f"missing environment variable {key}"
     return os.environ[key]
 
 
@@ -114,6 +114,29 @@ def split_by_worker(src):
         yield from src
 
 
+def split_by_node_and_worker(src, group=None):
+    """Split the input sequence by PyTorch distributed rank and DataLoader worker.
+
+    This gives the same disjoint, complete coverage of the input as using
+    split_by_node followed by split_by_worker, though each (rank, worker)
+    gets a different subset: consumer rank * num_workers + worker takes
+    every nsplits-th element in a single pass over the input.
+
+    Args:
+        src: The input sequence to be split.
+        group: The process group for distributed training.
+
+    Yields:
+        Elements from the input sequence based on the node's rank and the worker's ID.
+    """
+    rank, world_size, worker, num_workers = utils.pytorch_worker_info(group=group)
+    nsplits = world_size * num_workers
+    if nsplits > 1:
+        yield from islice(src, rank * num_workers + worker, None, nsplits)
+    else:
+        yield from src
+
+
 def expand_urls(urls):  # sourcery skip: for-index-underscore, last-if-guard
     """Expand the urls if they are a string.
 
@@ -202,8 +225,9 @@ class SimpleShardList(IterableDataset):
         Yields:
             dict: A dictionary containing the URL of each shard.
         """
-        urls = self.urls.copy()
+        urls = self.urls
         if self.seed is not None:
+            urls = urls.copy()
             random.Random(self.seed).shuffle(urls)
         for url in urls:
             yield dict(url=url)
@@ -219,11 +243,10 @@ def resampled_(src, n=sys.maxsize):
     Yields:
         Randomly chosen items from the source.
     """
-    import random
-
     seed = time.time()
     try:
-        seed = open("/dev/random", "rb").read(20)
+        # os.urandom never blocks, unlike reading /dev/random on older kernels
+        seed = os.urandom(20)
     except Exception as exn:
         print(repr(exn)[:50], file=sys.stderr)
     rng = random.Random(seed)
@@ -608,7 +631,7 @@ def shardspec(spec):
     Returns:
         IterableDataset: Either a MultiShardSample or a SimpleShardList based on the spec.
     """
-    if spec.endswith(".yaml"):
+    if spec.endswith((".yaml", ".yml")):
         return MultiShardSample(spec)
     else:
         return SimpleShardList(spec)
@@ -7,9 +7,11 @@
 
 """Low level iteration functions for tar archives."""
 
+import queue
 import random
 import re
 import tarfile
+import threading
 from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
 
 import braceexpand
@@ -49,7 +51,7 @@ def valid_sample(sample: Dict[str, Any]) -> bool:
     return (
         sample is not None
         and isinstance(sample, dict)
-        and len(list(sample.keys())) > 0
+        and len(sample) > 0
         and not sample.get("__bad__", False)
     )
 
@@ -66,7 +68,7 @@ def shardlist(urls, *, shuffle=False):
         Dictionary containing the URL.
     """
     if isinstance(urls, str):
-        urls = braceexpand.braceexpand(urls)
+        urls = list(braceexpand.braceexpand(urls))
     else:
         urls = list(urls)
     if shuffle:
@@ -210,6 +212,150 @@ def tar_file_expander(
                 break
 
 
+class _ShardFailure:
+    """Exception raised while expanding a shard in a prefetch thread."""
+
+    def __init__(self, exn):
+        self.exn = exn
+
+
+_shard_done = object()
+
+
+def _expand_shard(
+    source: Dict[str, Any],
+    output: queue.Queue,
+    stop: threading.Event,
+    handler: Callable[[Exception], bool],
+    select_files: Optional[Callable[[str], bool]],
+    rename_files: Optional[Callable[[str], str]],
+):
+    """Expand a single opened shard into a queue (runs in a prefetch thread).
+
+    Args:
+        source: Dictionary containing the url and the opened stream.
+        output: Queue receiving the samples, followed by `_shard_done`.
+        stop: Event signaling that the consumer has gone away.
+        handler: Exception handler for errors within the tar file.
+        select_files: Select files from tarfiles by name.
+        rename_files: Function to rename files.
+    """
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        url = source["url"]
+        local_path = source.get("local_path")
+        for sample in tar_file_iterator(
+            source["stream"],
+            handler=handler,
+            select_files=select_files,
+            rename_files=rename_files,
+        ):
+            sample["__url__"] = url
+            if local_path is not None:
+                sample["__local_path__"] = local_path
+            if not put(sample):
+                return
+    except Exception as exn:
+        exn.args = exn.args + (source.get("stream"), source.get("url"))
+        put(_ShardFailure(exn))
+    put(_shard_done)
+
+
+def tar_file_prefetcher(
+    data: Iterable[Dict[str, Any]],
+    prefetch: int = 2,
+    bufsize: int = 100,
+    handler: Callable[[Exception], bool] = reraise_exception,
+    select_files: Optional[Callable[[str], bool]] = None,
+    rename_files: Optional[Callable[[str], str]] = None,
+    eof_value: Optional[Any] = {},
+) -> Iterator[Dict[str, Any]]:
+    """Expand tar files, reading up to `prefetch` shards ahead in threads.
+
+    This is a drop-in replacement for tar_file_expander. Each shard is still
+    read sequentially by a single thread, and samples are yielded in the same
+    order as with tar_file_expander, but the next shards are already being
+    read and decompressed while the current one is consumed. As with
+    tar_file_expander, no `eof_value` is yielded for a shard that failed.
+
+    The reader threads are daemon threads, so an iterator that is still
+    alive at interpreter exit does not keep the process from exiting.
+
+    Args:
+        data: Iterator over opened tar file streams.
+        prefetch: Number of shards being read concurrently.
+        bufsize: Number of samples buffered per shard.
+        handler: Exception handler.
+        select_files: Select files from tarfiles by name (permits skipping files).
+        rename_files: Function to rename files.
+        eof_value: Value to yield at the end of each shard.
+
+    Yields:
+        A stream of samples.
+    """
+    assert prefetch >= 1
+    data = iter(data)
+    stop = threading.Event()
+    pending = []
+    threads = []
+
+    def submit():
+        try:
+            source = next(data)
+        except StopIteration:
+            return False
+        assert isinstance(source, dict)
+        assert "stream" in source
+        output = queue.Queue(maxsize=bufsize)
+        thread = threading.Thread(
+            target=_expand_shard,
+            args=(source, output, stop, handler, select_files, rename_files),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+        pending.append(output)
+        return True
+
+    try:
+        while len(pending) < prefetch and submit():
+            pass
+        while len(pending) > 0:
+            output = pending.pop(0)
+            threads[:] = [t for t in threads if t.is_alive()]
+            submit()
+            while True:
+                item = output.get()
+                if item is _shard_done:
+                    break
+                if isinstance(item, _ShardFailure):
+                    if handler(item.exn):
+                        break
+                    else:
+                        return
+                yield item
+            if item is not _shard_done:
+                # like tar_file_expander, a failed shard gets no EOF marker
+                continue
+            # we yield an EOF marker at the end of each shard so that
+            # samples from different shards don't get mixed up
+            if eof_value is not None:
+                yield eof_value
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
 def group_by_keys(
     data: Iterable[Dict[str, Any]],
     keys: Callable[[str], Tuple[str, str]] = base_plus_ext,
@@ -257,15 +403,17 @@ def group_by_keys(
                 if valid_sample(current_sample):
                     yield current_sample
                 current_sample = dict(__key__=prefix, __url__=filesample["__url__"])
+                # all files of a sample come from the same shard, so the
+                # shard metadata only needs to be copied once per sample
+                local_path = filesample.get("__local_path__")
+                if local_path is not None:
+                    current_sample["__local_path__"] = local_path
             if suffix in current_sample:
                 raise ValueError(
                     f"{fname}: duplicate file name in tar file {suffix} {current_sample.keys()}"
                 )
             if suffixes is None or suffix in suffixes:
                 current_sample[suffix] = value
-            local_path = filesample.get("__local_path__")
-            if local_path is not None:
-                current_sample["__local_path__"] = local_path
         except Exception as exn:
             exn.args = exn.args + (filesample.get("stream"), filesample.get("url"))
             if handler(exn):
@@ -281,6 +429,7 @@ def tarfile_samples(
     handler: Callable[[Exception], bool] = reraise_exception,
     select_files: Optional[Callable[[str], bool]] = None,
     rename_files: Optional[Callable[[str], str]] = None,
+    prefetch: int = 0,
 ) -> Iterable[Dict[str, Any]]:
     """Generate samples from a stream of tar files.
 
@@ -289,14 +438,27 @@ def tarfile_samples(
         handler: Exception handler.
         select_files: Function that selects files to be included.
         rename_files: Function to rename files.
+        prefetch: Number of shards to read ahead in threads (0 reads serially).
 
     Returns:
         Stream of samples.
     """
     streams = url_opener(src, handler=handler)
-    files = tar_file_expander(
-        streams, handler=handler, select_files=select_files, rename_files=rename_files
-    )
+    if prefetch > 0:
+        files = tar_file_prefetcher(
+            streams,
+            prefetch=prefetch,
+            handler=handler,
+            select_files=select_files,
+            rename_files=rename_files,
+        )
+    else:
+        files = tar_file_expander(
+            streams,
+            handler=handler,
+            select_files=select_files,
+            rename_files=rename_files,
+        )
     samples = group_by_keys(files, handler=handler)
     return samples
 
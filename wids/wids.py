@@ -514,8 +514,18 @@ class ShardListDataset(Dataset[T]):
         return sample
 
     def close(self):
-        """Close the dataset."""
-        self.cache.clear()
+        """Close the dataset, releasing all open shards."""
+        if self.cache is not None:
+            self.cache.clear()
+            self.cache = None
+
+    def __enter__(self):
+        """Enter the runtime context for the dataset."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the runtime context for the dataset, closing it."""
+        self.close()
 
 
 def lengths_to_ranges(lengths):
@@ -18,7 +18,10 @@ class LRUCache:
     def __setitem__(self, key, value):
         """Associate the given value with the given key."""
         if key in self.cache:
+            old = self.cache[key]
             self.cache.move_to_end(key)
+            if old is not value and self.release_handler is not None:
+                self.release_handler(key, old)
         self.cache[key] = value
         if len(self.cache) > self.capacity:
             key, value = self.cache.popitem(last=False)
@@ -54,10 +57,8 @@ class LRUCache:
         return self.cache.values()
 
     def clear(self):
+        """Remove all entries, releasing each of them exactly once."""
         for key in list(self.keys()):
-            value = self.cache[key]
-            if self.release_handler is not None:
-                self.release_handler(key, value)
             del self[key]
 
     def __del__(self):